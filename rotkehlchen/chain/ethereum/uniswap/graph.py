@@ -5,8 +5,10 @@ LIQUIDITY_POSITIONS_QUERY = (
     liquidityPositions
     (
         first: $limit,
-        skip: $offset,
+        orderBy: id,
+        orderDirection: asc,
         where: {{
+            id_gt: $last_id,
             user_in: $addresses,
             liquidityTokenBalance_gt: $balance,
         }}
@@ -43,12 +45,15 @@ TOKEN_DAY_DATAS_QUERY = (
     tokenDayDatas
     (
         first: $limit,
-        skip: $offset,
+        orderBy: id,
+        orderDirection: asc,
         where: {{
+            id_gt: $last_id,
             token_in: $token_ids,
             date: $datetime,
         }}
     ) {{
+        id
         date
         token {{
             id
@@ -60,18 +65,24 @@ TOKEN_DAY_DATAS_QUERY = (
 
 # Get trades queries
 
+# Swaps only request the tokens ids, the tokens metadata is requested once per
+# token via `TOKENS_QUERY`
+
 SWAPS_QUERY = (
     """
     swaps
     (
         first: $limit,
-        skip: $offset,
+        orderBy: id,
+        orderDirection: asc,
         where: {{
+            id_gt: $last_id,
             to: $address,
             timestamp_gte: $start_ts,
             timestamp_lte: $end_ts,
         }}
     ) {{
+        id
         transaction {{
             swaps {{
                 id
@@ -82,15 +93,9 @@ SWAPS_QUERY = (
                 pair {{
                     token0 {{
                         id
-                        decimals
-                        name
-                        symbol
                     }}
                     token1 {{
                         id
-                        decimals
-                        name
-                        symbol
                     }}
                 }}
                 amount0In
@@ -103,24 +108,49 @@ SWAPS_QUERY = (
     """
 )
 
+TOKENS_QUERY = (
+    """
+    tokens
+    (
+        first: $limit,
+        where: {{
+            id_in: $token_ids,
+        }}
+    ) {{
+        id
+        decimals
+        name
+        symbol
+    }}}}
+    """
+)
+
 # Get LP events queries
 # TODO: At the moment there are no protocol fees. However, it is possible they
 # turn them on in a future. The fees (from `feeTo` field in both `mints` and
 # `burns` schemas) would be already factorized in the events amounts.
 # Requesting and storing them in DB would just be for informing the user.
 # https://uniswap.org/docs/v2/advanced-topics/fees/#protocol-fees
+#
+# Mints and burns queries are root fields aliased by `alias` (e.g.
+# `mints_0`), so that the events of several addresses can be requested in a
+# single GraphQL document. Each alias has its own `$address_{alias}` and
+# `$last_id_{alias}` variables and the document closing brace is not included.
 MINTS_QUERY = (
     """
-    mints
+    {alias}: mints
     (
         first: $limit,
-        skip: $offset,
+        orderBy: id,
+        orderDirection: asc,
         where: {{
-            to: $address,
+            id_gt: $last_id_{alias},
+            to: $address_{alias},
             timestamp_gte: $start_ts,
             timestamp_lte: $end_ts,
         }}
     ) {{
+        id
         transaction {{
             id
         }}
@@ -146,22 +176,25 @@ MINTS_QUERY = (
         amount1
         amountUSD
         liquidity
-    }}}}
+    }}
     """
 )
 
 BURNS_QUERY = (
     """
-    burns
+    {alias}: burns
     (
         first: $limit,
-        skip: $offset,
+        orderBy: id,
+        orderDirection: asc,
         where: {{
-            sender: $address,
+            id_gt: $last_id_{alias},
+            sender: $address_{alias},
             timestamp_gte: $start_ts,
             timestamp_lte: $end_ts,
         }}
     ) {{
+        id
         transaction {{
             id
         }}
@@ -187,6 +220,6 @@ BURNS_QUERY = (
         amount1
         amountUSD
         liquidity
-    }}}}
+    }}
     """
 )
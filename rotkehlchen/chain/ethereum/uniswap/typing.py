@@ -1,5 +1,5 @@
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
 from typing import Any, DefaultDict, Dict, List, NamedTuple, Optional, Set, Tuple, Union
 
@@ -74,7 +74,6 @@ class LiquidityPool:
 
 
 AddressBalances = Dict[ChecksumEthAddress, List[LiquidityPool]]
-DDAddressBalances = DefaultDict[ChecksumEthAddress, List[LiquidityPool]]
 AssetPrice = Dict[ChecksumEthAddress, Price]
 
 
@@ -310,10 +309,11 @@ class LiquidityPoolEventsBalance(NamedTuple):
 
 @dataclass(init=True, repr=True)
 class AggregatedAmount:
-    events: List[LiquidityPoolEvent] = field(default_factory=list)
-    profit_loss0: FVal = ZERO
-    profit_loss1: FVal = ZERO
-    usd_profit_loss: FVal = ZERO
+    __slots__ = ('events', 'profit_loss0', 'profit_loss1', 'usd_profit_loss')
+    events: List[LiquidityPoolEvent]
+    profit_loss0: FVal
+    profit_loss1: FVal
+    usd_profit_loss: FVal
 
 
 AddressEvents = Dict[ChecksumEthAddress, List[LiquidityPoolEvent]]
@@ -1,11 +1,26 @@
 import logging
 from collections import defaultdict
 from datetime import datetime, time
+from functools import lru_cache
+from itertools import chain, groupby
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 from eth_utils import to_checksum_address
 from gevent.lock import Semaphore
+from gevent.pool import Pool
 
 from rotkehlchen.accounting.structures import Balance
 from rotkehlchen.assets.asset import EthereumToken
@@ -28,6 +43,7 @@ from rotkehlchen.typing import (
 )
 from rotkehlchen.user_messages import MessagesAggregator
 from rotkehlchen.utils.interfaces import EthereumModule
+from rotkehlchen.utils.misc import get_chunks
 
 from .graph import (
     BURNS_QUERY,
@@ -35,6 +51,7 @@ from .graph import (
     MINTS_QUERY,
     SWAPS_QUERY,
     TOKEN_DAY_DATAS_QUERY,
+    TOKENS_QUERY,
 )
 from .typing import (
     UNISWAP_EVENTS_PREFIX,
@@ -45,7 +62,6 @@ from .typing import (
     AddressTrades,
     AggregatedAmount,
     AssetPrice,
-    DDAddressBalances,
     DDAddressEvents,
     EventType,
     LiquidityPool,
@@ -62,6 +78,54 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+# Max number of subgraph requests in flight at the same time
+GRAPH_QUERY_CONCURRENCY = 8
+# Max number of addresses whose events are requested in a single query
+GRAPH_EVENTS_BATCH_SIZE = 10
+# Max number of addresses whose LP balances are queried on chain at the same time
+CHAIN_QUERY_CONCURRENCY = 4
+
+PRICE_ZERO = Price(ZERO)
+
+# The subgraph queries are static, so they are formatted once. Mints and
+# burns are still templates to be formatted with their alias.
+LIQUIDITY_POSITIONS_QUERYSTR = format_query_indentation(LIQUIDITY_POSITIONS_QUERY.format())
+SWAPS_QUERYSTR = format_query_indentation(SWAPS_QUERY.format())
+TOKENS_QUERYSTR = format_query_indentation(TOKENS_QUERY.format())
+TOKEN_DAY_DATAS_QUERYSTR = format_query_indentation(TOKEN_DAY_DATAS_QUERY.format())
+MINTS_QUERYSTR = format_query_indentation(MINTS_QUERY)
+BURNS_QUERYSTR = format_query_indentation(BURNS_QUERY)
+
+
+@lru_cache(maxsize=65536)
+def _to_checksum_address(address: str) -> ChecksumEthAddress:
+    """Cached `to_checksum_address()`
+
+    The subgraph responses repeat the same few addresses (users, pairs and
+    tokens) many times and each checksum requires a keccak256 hash.
+    """
+    return to_checksum_address(address)
+
+
+@lru_cache(maxsize=4096)
+def _get_ethereum_token(
+        symbol: str,
+        ethereum_address: ChecksumEthAddress,
+        name: str,
+        decimals: int,
+) -> Union[EthereumToken, UnknownEthereumToken]:
+    """Cached `get_ethereum_token()`
+
+    The same tokens appear in most of the subgraph positions, events and
+    swaps, and their metadata does not change.
+    """
+    return get_ethereum_token(
+        symbol=symbol,
+        ethereum_address=ethereum_address,
+        name=name,
+        decimals=decimals,
+    )
+
 
 def add_trades_from_swaps(
         swaps: List[AMMSwap],
@@ -112,6 +176,9 @@ class Uniswap(EthereumModule):
         self.msg_aggregator = msg_aggregator
         self.data_directory = data_directory
         self.trades_lock = Semaphore()
+        self.events_lock = Semaphore()
+        # Swap tokens by lowercase address, shared by all the trades queries
+        self.swap_tokens: Dict[str, Union[EthereumToken, UnknownEthereumToken]] = {}
         try:
             self.graph: Optional[Graph] = Graph(
                 'https://api.thegraph.com/subgraphs/name/uniswap/uniswap-v2',
@@ -149,20 +216,25 @@ class Uniswap(EthereumModule):
         # addresses and the values the aggregated amounts from their events
         for event in events:
             pool = event.pool_address
+            aggregated_amount = pool_aggregated_amount.get(pool)
+            if aggregated_amount is None:
+                aggregated_amount = pool_aggregated_amount[pool] = AggregatedAmount(
+                    events=[],
+                    profit_loss0=ZERO,
+                    profit_loss1=ZERO,
+                    usd_profit_loss=ZERO,
+                )
 
-            if pool not in pool_aggregated_amount:
-                pool_aggregated_amount[pool] = AggregatedAmount()
-
-            pool_aggregated_amount[pool].events.append(event)
+            aggregated_amount.events.append(event)
 
             if event.event_type == EventType.MINT:
-                pool_aggregated_amount[pool].profit_loss0 += event.amount0
-                pool_aggregated_amount[pool].profit_loss1 += event.amount1
-                pool_aggregated_amount[pool].usd_profit_loss += event.usd_price
+                aggregated_amount.profit_loss0 += event.amount0
+                aggregated_amount.profit_loss1 += event.amount1
+                aggregated_amount.usd_profit_loss += event.usd_price
             else:  # event_type == EventType.BURN
-                pool_aggregated_amount[pool].profit_loss0 -= event.amount0
-                pool_aggregated_amount[pool].profit_loss1 -= event.amount1
-                pool_aggregated_amount[pool].usd_profit_loss -= event.usd_price
+                aggregated_amount.profit_loss0 -= event.amount0
+                aggregated_amount.profit_loss1 -= event.amount1
+                aggregated_amount.usd_profit_loss -= event.usd_price
 
         # Instantiate `LiquidityPoolEventsBalance` per pool using
         # `pool_aggregated_amount`. If `pool_balance` exists (all events case),
@@ -173,12 +245,14 @@ class Uniswap(EthereumModule):
             usd_profit_loss = aggregated_amount.usd_profit_loss
 
             # Add current pool balances looking up the pool
-            if pool in pool_balance:
-                token0 = pool_balance[pool].assets[0].asset
-                token1 = pool_balance[pool].assets[1].asset
-                profit_loss0 -= pool_balance[pool].assets[0].user_balance.amount
-                profit_loss1 -= pool_balance[pool].assets[1].user_balance.amount
-                usd_profit_loss -= pool_balance[pool].user_balance.usd_value
+            liquidity_pool = pool_balance.get(pool)
+            if liquidity_pool is not None:
+                asset0, asset1 = liquidity_pool.assets[0], liquidity_pool.assets[1]
+                token0 = asset0.asset
+                token1 = asset1.asset
+                profit_loss0 -= asset0.user_balance.amount
+                profit_loss1 -= asset1.user_balance.amount
+                usd_profit_loss -= liquidity_pool.user_balance.usd_value
             else:
                 # NB: get `token0` and `token1` from any pool event
                 token0 = aggregated_amount.events[0].token0
@@ -207,21 +281,21 @@ class Uniswap(EthereumModule):
 
         Each liquidity position is converted into a <LiquidityPool>.
         """
-        address_balances: DDAddressBalances = defaultdict(list)
+        address_balances: AddressBalances = {address: [] for address in addresses}
         known_assets: Set[EthereumToken] = set()
         unknown_assets: Set[UnknownEthereumToken] = set()
 
         addresses_lower = [address.lower() for address in addresses]
-        querystr = format_query_indentation(LIQUIDITY_POSITIONS_QUERY.format())
+        querystr = LIQUIDITY_POSITIONS_QUERYSTR
         param_types = {
             '$limit': 'Int!',
-            '$offset': 'Int!',
+            '$last_id': 'ID!',
             '$addresses': '[String!]',
             '$balance': 'BigDecimal!',
         }
-        param_values = {
+        param_values: Dict[str, Any] = {
             'limit': GRAPH_QUERY_LIMIT,
-            'offset': 0,
+            'last_id': '',
             'addresses': addresses_lower,
             'balance': '0',
         }
@@ -234,10 +308,10 @@ class Uniswap(EthereumModule):
             result_data = result['liquidityPositions']
 
             for lp in result_data:
-                user_address = to_checksum_address(lp['user']['id'])
+                user_address = _to_checksum_address(lp['user']['id'])
                 user_lp_balance = FVal(lp['liquidityTokenBalance'])
                 lp_pair = lp['pair']
-                lp_address = to_checksum_address(lp_pair['id'])
+                lp_address = _to_checksum_address(lp_pair['id'])
                 lp_total_supply = FVal(lp_pair['totalSupply'])
 
                 # Insert LP tokens reserves within tokens dicts
@@ -250,9 +324,9 @@ class Uniswap(EthereumModule):
 
                 for token in token0, token1:
                     # Get the token <EthereumToken> or <UnknownEthereumToken>
-                    asset = get_ethereum_token(
+                    asset = _get_ethereum_token(
                         symbol=token['symbol'],
-                        ethereum_address=to_checksum_address(token['id']),
+                        ethereum_address=_to_checksum_address(token['id']),
                         name=token['name'],
                         decimals=int(token['decimals']),
                     )
@@ -282,20 +356,22 @@ class Uniswap(EthereumModule):
                     total_supply=lp_total_supply,
                     user_balance=Balance(amount=user_lp_balance),
                 )
-                address_balances[user_address].append(liquidity_pool)
+                if user_address in address_balances:
+                    address_balances[user_address].append(liquidity_pool)
+                else:
+                    address_balances[user_address] = [liquidity_pool]
 
             # Check whether an extra request is needed
             if len(result_data) < GRAPH_QUERY_LIMIT:
                 break
 
-            # Update pagination step
-            param_values = {
-                **param_values,
-                'offset': param_values['offset'] + GRAPH_QUERY_LIMIT,  # type: ignore
-            }
+            # Update pagination step (keyset pagination on the entity id)
+            param_values['last_id'] = result_data[-1]['id']
 
         protocol_balance = ProtocolBalance(
-            address_balances=dict(address_balances),
+            address_balances={
+                address: lps for address, lps in address_balances.items() if len(lps) != 0
+            },
             known_assets=known_assets,
             unknown_assets=unknown_assets,
         )
@@ -309,14 +385,23 @@ class Uniswap(EthereumModule):
         lp_addresses = get_latest_lp_addresses(self.data_directory)
 
         address_mapping = {}
-        for address in addresses:
-            pool_balances = uniswap_lp_token_balances(
-                address=address,
-                ethereum=self.ethereum,
-                lp_addresses=lp_addresses,
-                known_assets=known_assets,
-                unknown_assets=unknown_assets,
+        pool = Pool(size=CHAIN_QUERY_CONCURRENCY)
+        try:
+            results = pool.map(
+                lambda address: uniswap_lp_token_balances(
+                    address=address,
+                    ethereum=self.ethereum,
+                    lp_addresses=lp_addresses,
+                    known_assets=known_assets,
+                    unknown_assets=unknown_assets,
+                ),
+                addresses,
             )
+        finally:
+            # Stop the queries still running if any of them failed
+            pool.kill()
+
+        for address, pool_balances in zip(addresses, results):
             if len(pool_balances) != 0:
                 address_mapping[address] = pool_balances
 
@@ -343,7 +428,7 @@ class Uniswap(EthereumModule):
         for known_asset in known_assets:
             asset_usd_price = price_query(known_asset)
 
-            if asset_usd_price != Price(ZERO):
+            if asset_usd_price != PRICE_ZERO:
                 asset_price[known_asset.ethereum_address] = asset_usd_price
             else:
                 unknown_asset = UnknownEthereumToken(
@@ -429,34 +514,34 @@ class Uniswap(EthereumModule):
         address_events: DDAddressEvents = defaultdict(list)
         db_address_events: AddressEvents = {}
         new_addresses: List[ChecksumEthAddress] = []
-        existing_addresses: List[ChecksumEthAddress] = []
-        min_end_ts: Timestamp = to_timestamp
+        # Existing addresses grouped by their last queried timestamp
+        end_ts_existing_addresses: DefaultDict[Timestamp, List[ChecksumEthAddress]] = (
+            defaultdict(list)
+        )
 
         # Get addresses' last used query range for Uniswap events
-        for address in addresses:
-            entry_name = f'{UNISWAP_EVENTS_PREFIX}_{address}'
-            events_range = self.database.get_used_query_range(name=entry_name)
+        entry_names = [f'{UNISWAP_EVENTS_PREFIX}_{address}' for address in addresses]
+        events_ranges = self.database.get_used_query_ranges(entry_names)
+        for address, entry_name in zip(addresses, entry_names):
+            events_range = events_ranges.get(entry_name)
 
             if not events_range:
                 new_addresses.append(address)
             else:
-                existing_addresses.append(address)
-                min_end_ts = min(min_end_ts, events_range[1])
+                end_ts_existing_addresses[events_range[1]].append(address)
 
         # Request new addresses' events
         if new_addresses:
             start_ts = Timestamp(0)
-            for address in new_addresses:
-                for event_type in EventType:
-                    new_address_events = self._get_events_graph(
-                        address=address,
-                        start_ts=start_ts,
-                        end_ts=to_timestamp,
-                        event_type=event_type,
-                    )
-                    if new_address_events:
-                        address_events[address].extend(new_address_events)
+            new_address_events = self._get_addresses_events_graph(
+                addresses=new_addresses,
+                start_ts=start_ts,
+                end_ts=to_timestamp,
+            )
+            for address, events in new_address_events.items():
+                address_events[address].extend(events)
 
+            for address in new_addresses:
                 # Insert new address' last used query range
                 self.database.update_used_query_range(
                     name=f'{UNISWAP_EVENTS_PREFIX}_{address}',
@@ -464,23 +549,25 @@ class Uniswap(EthereumModule):
                     end_ts=to_timestamp,
                 )
 
-        # Request existing DB addresses' events
-        if existing_addresses and min_end_ts <= to_timestamp:
-            for address in existing_addresses:
-                for event_type in EventType:
-                    address_new_events = self._get_events_graph(
-                        address=address,
-                        start_ts=min_end_ts,
-                        end_ts=to_timestamp,
-                        event_type=event_type,
-                    )
-                    if address_new_events:
-                        address_events[address].extend(address_new_events)
+        # Request existing DB addresses' events. Each group of addresses is
+        # only requested since its own last queried timestamp.
+        for end_ts, existing_addresses in end_ts_existing_addresses.items():
+            if end_ts > to_timestamp:
+                continue
+
+            address_new_events = self._get_addresses_events_graph(
+                addresses=existing_addresses,
+                start_ts=end_ts,
+                end_ts=to_timestamp,
+            )
+            for address, events in address_new_events.items():
+                address_events[address].extend(events)
 
+            for address in existing_addresses:
                 # Update existing address' last used query range
                 self.database.update_used_query_range(
                     name=f'{UNISWAP_EVENTS_PREFIX}_{address}',
-                    start_ts=min_end_ts,
+                    start_ts=end_ts,
                     end_ts=to_timestamp,
                 )
 
@@ -526,91 +613,133 @@ class Uniswap(EthereumModule):
 
         return address_events_balances
 
+    def _get_addresses_events_graph(
+            self,
+            addresses: List[ChecksumEthAddress],
+            start_ts: Timestamp,
+            end_ts: Timestamp,
+    ) -> AddressEvents:
+        """Get the addresses' events (mints & burns) querying the Uniswap
+        subgraph concurrently, one request per batch of addresses.
+
+        May raise:
+        - RemoteError: If there is a problem querying the subgraph
+        """
+        pool = Pool(size=GRAPH_QUERY_CONCURRENCY)
+        try:
+            results = pool.map(
+                lambda addresses_batch: self._get_events_graph(
+                    addresses=addresses_batch,
+                    start_ts=start_ts,
+                    end_ts=end_ts,
+                ),
+                list(get_chunks(addresses, n=GRAPH_EVENTS_BATCH_SIZE)),
+            )
+        finally:
+            # Stop the queries still running if any of them failed
+            pool.kill()
+
+        address_events: AddressEvents = {}
+        for batch_address_events in results:
+            address_events.update(batch_address_events)
+
+        return address_events
+
     def _get_events_graph(
             self,
-            address: ChecksumEthAddress,
+            addresses: List[ChecksumEthAddress],
             start_ts: Timestamp,
             end_ts: Timestamp,
-            event_type: EventType,
-    ) -> List[LiquidityPoolEvent]:
-        """Get the address' events (mints & burns) querying the Uniswap subgraph
+    ) -> AddressEvents:
+        """Get the addresses' events (mints & burns) querying the Uniswap subgraph
         Each event data is stored in a <LiquidityPoolEvent>.
-        """
-        address_events: List[LiquidityPoolEvent] = []
-        if event_type == EventType.MINT:
-            query = MINTS_QUERY
-            query_schema = 'mints'
-        elif event_type == EventType.BURN:
-            query = BURNS_QUERY
-            query_schema = 'burns'
-        else:
-            log.error(f'Unexpected event_type: {event_type}. Skipping events query.')
-            return address_events
 
-        param_types = {
-            '$limit': 'Int!',
-            '$offset': 'Int!',
-            '$address': 'Bytes!',
-            '$start_ts': 'BigInt!',
-            '$end_ts': 'BigInt!',
-        }
-        param_values = {
+        All the addresses' events are requested in a single GraphQL document
+        with an aliased root field per address and event type. Each alias is
+        paginated with its own cursor and dropped from the document once it
+        has no more pages.
+
+        May raise:
+        - RemoteError: If there is a problem querying the subgraph
+        """
+        address_events: AddressEvents = {}
+        param_values: Dict[str, Any] = {
             'limit': GRAPH_QUERY_LIMIT,
-            'offset': 0,
-            'address': address.lower(),
             'start_ts': str(start_ts),
             'end_ts': str(end_ts),
         }
-        querystr = format_query_indentation(query.format())
-
-        while True:
+        # Aliases still having pages to request, e.g. 'mints_0', 'burns_0'
+        pending_aliases: Dict[str, Tuple[ChecksumEthAddress, EventType]] = {}
+        for idx, address in enumerate(addresses):
+            address_lower = address.lower()
+            for event_type in EventType:
+                alias = f'{event_type}s_{idx}'
+                param_values[f'address_{alias}'] = address_lower
+                param_values[f'last_id_{alias}'] = ''
+                pending_aliases[alias] = (address, event_type)
+
+        while len(pending_aliases) != 0:
+            param_types = {
+                '$limit': 'Int!',
+                '$start_ts': 'BigInt!',
+                '$end_ts': 'BigInt!',
+            }
+            queries = []
+            for alias, (_, event_type) in pending_aliases.items():
+                param_types[f'$address_{alias}'] = 'Bytes!'
+                param_types[f'$last_id_{alias}'] = 'ID!'
+                query = MINTS_QUERYSTR if event_type == EventType.MINT else BURNS_QUERYSTR
+                queries.append(query.format(alias=alias))
+
+            querystr = ' '.join(queries) + '}'
             result = self.graph.query(  # type: ignore # caller already checks
                 querystr=querystr,
                 param_types=param_types,
                 param_values=param_values,
             )
-            result_data = result[query_schema]
-
-            for event in result_data:
-                token0_ = event['pair']['token0']
-                token1_ = event['pair']['token1']
-                token0 = get_ethereum_token(
-                    symbol=token0_['symbol'],
-                    ethereum_address=to_checksum_address(token0_['id']),
-                    name=token0_['name'],
-                    decimals=token0_['decimals'],
-                )
-                token1 = get_ethereum_token(
-                    symbol=token1_['symbol'],
-                    ethereum_address=to_checksum_address(token1_['id']),
-                    name=token1_['name'],
-                    decimals=int(token1_['decimals']),
-                )
-                lp_event = LiquidityPoolEvent(
-                    tx_hash=event['transaction']['id'],
-                    log_index=int(event['logIndex']),
-                    address=address,
-                    timestamp=Timestamp(int(event['timestamp'])),
-                    event_type=event_type,
-                    pool_address=to_checksum_address(event['pair']['id']),
-                    token0=token0,
-                    token1=token1,
-                    amount0=AssetAmount(FVal(event['amount0'])),
-                    amount1=AssetAmount(FVal(event['amount1'])),
-                    usd_price=Price(FVal(event['amountUSD'])),
-                    lp_amount=AssetAmount(FVal(event['liquidity'])),
-                )
-                address_events.append(lp_event)
+            for alias, (address, event_type) in list(pending_aliases.items()):
+                result_data = result[alias]
+
+                for event in result_data:
+                    token0_ = event['pair']['token0']
+                    token1_ = event['pair']['token1']
+                    token0 = _get_ethereum_token(
+                        symbol=token0_['symbol'],
+                        ethereum_address=_to_checksum_address(token0_['id']),
+                        name=token0_['name'],
+                        decimals=int(token0_['decimals']),
+                    )
+                    token1 = _get_ethereum_token(
+                        symbol=token1_['symbol'],
+                        ethereum_address=_to_checksum_address(token1_['id']),
+                        name=token1_['name'],
+                        decimals=int(token1_['decimals']),
+                    )
+                    lp_event = LiquidityPoolEvent(
+                        tx_hash=event['transaction']['id'],
+                        log_index=int(event['logIndex']),
+                        address=address,
+                        timestamp=Timestamp(int(event['timestamp'])),
+                        event_type=event_type,
+                        pool_address=_to_checksum_address(event['pair']['id']),
+                        token0=token0,
+                        token1=token1,
+                        amount0=AssetAmount(FVal(event['amount0'])),
+                        amount1=AssetAmount(FVal(event['amount1'])),
+                        usd_price=Price(FVal(event['amountUSD'])),
+                        lp_amount=AssetAmount(FVal(event['liquidity'])),
+                    )
+                    address_events.setdefault(address, []).append(lp_event)
 
-            # Check whether an extra request is needed
-            if len(result_data) < GRAPH_QUERY_LIMIT:
-                break
+                # Check whether an extra request is needed
+                if len(result_data) < GRAPH_QUERY_LIMIT:
+                    pending_aliases.pop(alias)
+                    param_values.pop(f'address_{alias}')
+                    param_values.pop(f'last_id_{alias}')
+                    continue
 
-            # Update pagination step
-            param_values = {
-                **param_values,
-                'offset': param_values['offset'] + GRAPH_QUERY_LIMIT,  # type: ignore
-            }
+                # Update pagination step (keyset pagination on the entity id)
+                param_values[f'last_id_{alias}'] = result_data[-1]['id']
 
         return address_events
 
@@ -631,9 +760,10 @@ class Uniswap(EthereumModule):
         min_end_ts: Timestamp = to_timestamp
 
         # Get addresses' last used query range for Uniswap trades
-        for address in addresses:
-            entry_name = f'{UNISWAP_TRADES_PREFIX}_{address}'
-            trades_range = self.database.get_used_query_range(name=entry_name)
+        entry_names = [f'{UNISWAP_TRADES_PREFIX}_{address}' for address in addresses]
+        trades_ranges = self.database.get_used_query_ranges(entry_names)
+        for address, entry_name in zip(addresses, entry_names):
+            trades_range = trades_ranges.get(entry_name)
 
             if not trades_range:
                 new_addresses.append(address)
@@ -678,13 +808,12 @@ class Uniswap(EthereumModule):
                     end_ts=to_timestamp,
                 )
 
-        # Insert all unique swaps to the D
-        all_swaps = set()
-        for address in filter(lambda address: address in address_amm_trades, addresses):
-            for trade in address_amm_trades[address]:
-                for swap in trade.swaps:
-                    all_swaps.add(swap)
-
+        # Insert all unique swaps to the DB
+        all_swaps = set(chain.from_iterable(
+            trade.swaps
+            for address in addresses
+            for trade in address_amm_trades.get(address, ())
+        ))
         self.database.add_amm_swaps(list(all_swaps))
 
         # Fetch all DB Uniswap trades within the time range
@@ -709,18 +838,11 @@ class Uniswap(EthereumModule):
 
         # sort by timestamp and then by log index
         swaps.sort(key=lambda trade: (trade.timestamp, -trade.log_index), reverse=True)
-        last_tx_hash = swaps[0].tx_hash
-        current_swaps: List[AMMSwap] = []
-        for swap in swaps:
-            if swap.tx_hash != last_tx_hash:
-                trades.extend(Uniswap._tx_swaps_to_trades(current_swaps))
-                current_swaps = []
-
-            current_swaps.append(swap)
-            last_tx_hash = swap.tx_hash
-
-        if len(current_swaps) != 0:
-            trades.extend(Uniswap._tx_swaps_to_trades(current_swaps))
+        # a transaction's logs take a contiguous range of its block log
+        # indexes, so after the sort its swaps are contiguous
+        for _, tx_swaps in groupby(swaps, key=lambda swap: swap.tx_hash):
+            trades.extend(Uniswap._tx_swaps_to_trades(list(tx_swaps)))
+
         return trades
 
     def _get_trades_graph(
@@ -729,9 +851,24 @@ class Uniswap(EthereumModule):
             start_ts: Timestamp,
             end_ts: Timestamp,
     ) -> AddressTrades:
+        """Get the addresses' trades querying the Uniswap subgraph
+        concurrently, one request per address.
+
+        May raise:
+        - RemoteError: If there is a problem querying the subgraph
+        """
         address_trades = {}
-        for address in addresses:
-            trades = self._get_trades_graph_for_address(address, start_ts, end_ts)
+        pool = Pool(size=GRAPH_QUERY_CONCURRENCY)
+        try:
+            results = pool.map(
+                lambda address: self._get_trades_graph_for_address(address, start_ts, end_ts),
+                addresses,
+            )
+        finally:
+            # Stop the queries still running if any of them failed
+            pool.kill()
+
+        for address, trades in zip(addresses, results):
             if len(trades) != 0:
                 address_trades[address] = trades
 
@@ -757,23 +894,30 @@ class Uniswap(EthereumModule):
         Trade type SELL:
         - `asset0In` (BASE, reserve0) is gt 0.
         - `asset1Out` (QUOTE, reserve1) is gt 0.
+
+        May raise:
+        - RemoteError: If there is a problem querying the subgraph
         """
         trades: List[AMMTrade] = []
+        # Every swap of a transaction sent `to` the address returns the whole
+        # transaction swaps, so a transaction's trades are only built once
+        tx_trades: Dict[str, List[AMMTrade]] = {}
+        tokens = self.swap_tokens
         param_types = {
             '$limit': 'Int!',
-            '$offset': 'Int!',
+            '$last_id': 'ID!',
             '$address': 'Bytes!',
             '$start_ts': 'BigInt!',
             '$end_ts': 'BigInt!',
         }
-        param_values = {
+        param_values: Dict[str, Any] = {
             'limit': GRAPH_QUERY_LIMIT,
-            'offset': 0,
+            'last_id': '',
             'address': address.lower(),
             'start_ts': str(start_ts),
             'end_ts': str(end_ts),
         }
-        querystr = format_query_indentation(SWAPS_QUERY.format())
+        querystr = SWAPS_QUERYSTR
 
         while True:
             result = self.graph.query(  # type: ignore # caller already checks
@@ -782,24 +926,36 @@ class Uniswap(EthereumModule):
                 param_values=param_values,
             )
             result_data = result['swaps']
+
+            # Request the metadata of the tokens not seen in previous queries
+            token_ids = {
+                token['id']
+                for entry in result_data
+                for swap in entry['transaction']['swaps']
+                for token in (swap['pair']['token0'], swap['pair']['token1'])
+            }
+            new_token_ids = list(token_ids - tokens.keys())
+            if len(new_token_ids) != 0:
+                tokens.update(self._get_tokens_graph(new_token_ids))
+                missing_token_ids = token_ids - tokens.keys()
+                if len(missing_token_ids) != 0:
+                    raise RemoteError(
+                        f'Uniswap subgraph did not return the tokens '
+                        f'{", ".join(sorted(missing_token_ids))} of the {address} swaps',
+                    )
+
             for entry in result_data:
+                tx_swaps = entry['transaction']['swaps']
+                tx_hash = tx_swaps[0]['id'].split('-')[0]
+                if tx_hash in tx_trades:
+                    trades.extend(tx_trades[tx_hash])
+                    continue
+
                 swaps = []
-                for swap in entry['transaction']['swaps']:
+                for swap in tx_swaps:
                     timestamp = swap['timestamp']
-                    swap_token0 = swap['pair']['token0']
-                    swap_token1 = swap['pair']['token1']
-                    token0 = get_ethereum_token(
-                        symbol=swap_token0['symbol'],
-                        ethereum_address=to_checksum_address(swap_token0['id']),
-                        name=swap_token0['name'],
-                        decimals=swap_token0['decimals'],
-                    )
-                    token1 = get_ethereum_token(
-                        symbol=swap_token1['symbol'],
-                        ethereum_address=to_checksum_address(swap_token1['id']),
-                        name=swap_token1['name'],
-                        decimals=int(swap_token1['decimals']),
-                    )
+                    token0 = tokens[swap['pair']['token0']['id']]
+                    token1 = tokens[swap['pair']['token1']['id']]
                     amount0_in = FVal(swap['amount0In'])
                     amount1_in = FVal(swap['amount1In'])
                     amount0_out = FVal(swap['amount0Out'])
@@ -808,8 +964,8 @@ class Uniswap(EthereumModule):
                         tx_hash=swap['id'].split('-')[0],
                         log_index=int(swap['logIndex']),
                         address=address,
-                        from_address=to_checksum_address(swap['sender']),
-                        to_address=to_checksum_address(swap['to']),
+                        from_address=_to_checksum_address(swap['sender']),
+                        to_address=_to_checksum_address(swap['to']),
                         timestamp=Timestamp(int(timestamp)),
                         location=Location.UNISWAP,
                         token0=token0,
@@ -821,19 +977,50 @@ class Uniswap(EthereumModule):
                     ))
 
                 # Now that we got all swaps for a transaction, create the trade object
-                trades.extend(self._tx_swaps_to_trades(swaps))
+                tx_trades[tx_hash] = self._tx_swaps_to_trades(swaps)
+                trades.extend(tx_trades[tx_hash])
 
             # Check whether an extra request is needed
             if len(result_data) < GRAPH_QUERY_LIMIT:
                 break
 
             # Update pagination step
-            param_values = {
-                **param_values,
-                'offset': param_values['offset'] + GRAPH_QUERY_LIMIT,  # type: ignore
-            }
+            param_values['last_id'] = result_data[-1]['id']
         return trades
 
+    def _get_tokens_graph(
+            self,
+            token_ids: List[str],
+    ) -> Dict[str, Union[EthereumToken, UnknownEthereumToken]]:
+        """Get the tokens via the Uniswap subgraph
+
+        `token_ids` are the tokens addresses in lowercase, which are also the
+        keys of the returned dict.
+        """
+        tokens: Dict[str, Union[EthereumToken, UnknownEthereumToken]] = {}
+        param_types = {
+            '$limit': 'Int!',
+            '$token_ids': '[ID!]',
+        }
+        for chunk_token_ids in get_chunks(token_ids, n=GRAPH_QUERY_LIMIT):
+            result = self.graph.query(  # type: ignore # caller already checks
+                querystr=TOKENS_QUERYSTR,
+                param_types=param_types,
+                param_values={
+                    'limit': GRAPH_QUERY_LIMIT,
+                    'token_ids': chunk_token_ids,
+                },
+            )
+            for token in result['tokens']:
+                tokens[token['id']] = _get_ethereum_token(
+                    symbol=token['symbol'],
+                    ethereum_address=_to_checksum_address(token['id']),
+                    name=token['name'],
+                    decimals=int(token['decimals']),
+                )
+
+        return tokens
+
     @staticmethod
     def _get_unknown_asset_price_graph(
             unknown_assets: Set[UnknownEthereumToken],
@@ -842,6 +1029,9 @@ class Uniswap(EthereumModule):
         """Get today's tokens prices via the Uniswap subgraph
 
         Uniswap provides a token price every day at 00:00:00 UTC
+
+        There is at most one token day data per token and date, so the tokens
+        are requested concurrently in chunks that fit in a single page.
         """
         asset_price: AssetPrice = {}
 
@@ -851,22 +1041,51 @@ class Uniswap(EthereumModule):
         unknown_assets_addresses_lower = (
             [address.lower() for address in unknown_assets_addresses]
         )
-
-        querystr = format_query_indentation(TOKEN_DAY_DATAS_QUERY.format())
         today_epoch = int(
             datetime.combine(datetime.utcnow().date(), time.min).timestamp(),
         )
+        pool = Pool(size=GRAPH_QUERY_CONCURRENCY)
+        try:
+            results = pool.map(
+                lambda token_ids: Uniswap._get_token_day_datas_graph(
+                    token_ids=token_ids,
+                    date=today_epoch,
+                    graph_query=graph_query,
+                ),
+                list(get_chunks(unknown_assets_addresses_lower, n=GRAPH_QUERY_LIMIT)),
+            )
+        finally:
+            # Stop the queries still running if any of them failed
+            pool.kill()
+
+        for token_ids_asset_price in results:
+            asset_price.update(token_ids_asset_price)
+
+        return asset_price
+
+    @staticmethod
+    def _get_token_day_datas_graph(
+            token_ids: List[str],
+            date: int,
+            graph_query: Callable,
+    ) -> AssetPrice:
+        """Get the tokens prices at the given date via the Uniswap subgraph
+
+        `token_ids` are the tokens addresses in lowercase.
+        """
+        asset_price: AssetPrice = {}
+        querystr = TOKEN_DAY_DATAS_QUERYSTR
         param_types = {
             '$limit': 'Int!',
-            '$offset': 'Int!',
+            '$last_id': 'ID!',
             '$token_ids': '[String!]',
             '$datetime': 'Int!',
         }
-        param_values = {
+        param_values: Dict[str, Any] = {
             'limit': GRAPH_QUERY_LIMIT,
-            'offset': 0,
-            'token_ids': unknown_assets_addresses_lower,
-            'datetime': today_epoch,
+            'last_id': '',
+            'token_ids': token_ids,
+            'datetime': date,
         }
         while True:
             result = graph_query(
@@ -876,19 +1095,17 @@ class Uniswap(EthereumModule):
             )
             result_data = result['tokenDayDatas']
 
-            for tdd in result_data:
-                token_address = to_checksum_address(tdd['token']['id'])
-                asset_price[token_address] = Price(FVal(tdd['priceUSD']))
+            asset_price.update({
+                _to_checksum_address(tdd['token']['id']): Price(FVal(tdd['priceUSD']))
+                for tdd in result_data
+            })
 
             # Check whether an extra request is needed
             if len(result_data) < GRAPH_QUERY_LIMIT:
                 break
 
             # Update pagination step
-            param_values = {
-                **param_values,
-                'offset': param_values['offset'] + GRAPH_QUERY_LIMIT,  # type: ignore
-            }
+            param_values['last_id'] = result_data[-1]['id']
 
         return asset_price
 
@@ -901,25 +1118,22 @@ class Uniswap(EthereumModule):
         """Update the pools underlying assets prices in USD (prices obtained
         via Inquirer and the Uniswap subgraph)
         """
+        # Known asset prices take precedence over the unknown asset ones
+        asset_price = {**unknown_asset_price, **known_asset_price}
         for lps in address_balances.values():
             for lp in lps:
                 # Try to get price from either known or unknown asset price.
                 # Otherwise keep existing price (zero)
                 total_user_balance = FVal(0)
                 for asset in lp.assets:
-                    asset_ethereum_address = asset.asset.ethereum_address
-                    asset_usd_price = known_asset_price.get(
-                        asset_ethereum_address,
-                        unknown_asset_price.get(asset_ethereum_address, Price(ZERO)),
-                    )
+                    asset_user_balance = asset.user_balance
+                    asset_usd_price = asset_price.get(asset.asset.ethereum_address, PRICE_ZERO)
                     # Update <LiquidityPoolAsset> if asset USD price exists
-                    if asset_usd_price != Price(ZERO):
+                    if asset_usd_price != PRICE_ZERO:
                         asset.usd_price = asset_usd_price
-                        asset.user_balance.usd_value = FVal(
-                            asset.user_balance.amount * asset_usd_price,
-                        )
+                        asset_user_balance.usd_value = asset_user_balance.amount * asset_usd_price
 
-                    total_user_balance += asset.user_balance.usd_value
+                    total_user_balance += asset_user_balance.usd_value
 
                 # Update <LiquidityPool> total balance in USD
                 lp.user_balance.usd_value = total_user_balance
@@ -945,6 +1159,9 @@ class Uniswap(EthereumModule):
 
         known_assets = protocol_balance.known_assets
         unknown_assets = protocol_balance.unknown_assets
+        # No pools, hence no assets to price
+        if len(known_assets) == 0 and len(unknown_assets) == 0:
+            return protocol_balance.address_balances
 
         known_asset_price = self._get_known_asset_price(
             known_assets=known_assets,
@@ -959,11 +1176,12 @@ class Uniswap(EthereumModule):
                 graph_query=self.graph.query,  # type: ignore # caller already checks
             )
 
-        self._update_assets_prices_in_address_balances(
-            address_balances=protocol_balance.address_balances,
-            known_asset_price=known_asset_price,
-            unknown_asset_price=unknown_asset_price,
-        )
+        if len(known_asset_price) != 0 or len(unknown_asset_price) != 0:
+            self._update_assets_prices_in_address_balances(
+                address_balances=protocol_balance.address_balances,
+                known_asset_price=known_asset_price,
+                unknown_asset_price=unknown_asset_price,
+            )
 
         return protocol_balance.address_balances
 
@@ -979,7 +1197,7 @@ class Uniswap(EthereumModule):
         if self.graph is None:  # could not initialize graph
             return {}
 
-        with self.trades_lock:
+        with self.events_lock:
             if reset_db_data is True:
                 self.database.delete_uniswap_events_data()
 
@@ -998,16 +1216,12 @@ class Uniswap(EthereumModule):
             to_timestamp: Timestamp,
     ) -> List[AMMTrade]:
         with self.trades_lock:
-            all_trades = []
             trade_mapping = self._get_trades(
                 addresses=addresses,
                 from_timestamp=from_timestamp,
                 to_timestamp=to_timestamp,
             )
-            for _, trades in trade_mapping.items():
-                all_trades.extend(trades)
-
-            return all_trades
+            return list(chain.from_iterable(trade_mapping.values()))
 
     def get_trades_history(
         self,
@@ -101,7 +101,7 @@ from rotkehlchen.typing import (
 )
 from rotkehlchen.user_messages import MessagesAggregator
 from rotkehlchen.utils.hashing import file_md5
-from rotkehlchen.utils.misc import ts_now
+from rotkehlchen.utils.misc import get_chunks, ts_now
 from rotkehlchen.utils.serialization import rlk_jsondumps, rlk_jsonloads_dict
 
 logger = logging.getLogger(__name__)
@@ -109,6 +109,9 @@ log = RotkehlchenLogsAdapter(logger)
 
 KDF_ITER = 64000
 DBINFO_FILENAME = 'dbinfo.json'
+# Max names per used query ranges SELECT, below the 999 bound variables
+# limit of SQLite versions older than 3.32
+USED_QUERY_RANGES_CHUNK_SIZE = 500
 
 DBTupleType = Literal[
     'trade',
@@ -1009,6 +1012,29 @@ class DBHandler:
 
         return Timestamp(int(query[0][0])), Timestamp(int(query[0][1]))
 
+    def get_used_query_ranges(self, names: List[str]) -> Dict[str, Tuple[Timestamp, Timestamp]]:
+        """Get the last start/end timestamp range that has been queried for
+        each of the given names in a single DB query
+
+        Names without a query range are not included in the returned dict
+        """
+        query_ranges: Dict[str, Tuple[Timestamp, Timestamp]] = {}
+        cursor = self.conn.cursor()
+        for chunk_names in get_chunks(names, n=USED_QUERY_RANGES_CHUNK_SIZE):
+            questionmarks = '?' * len(chunk_names)
+            query = cursor.execute(
+                f'SELECT name, start_ts, end_ts from used_query_ranges '
+                f'WHERE name IN ({",".join(questionmarks)});',
+                chunk_names,
+            )
+            query_ranges.update({
+                name: (Timestamp(int(start_ts)), Timestamp(int(end_ts)))
+                for name, start_ts, end_ts in query
+                if start_ts is not None
+            })
+
+        return query_ranges
+
     def delete_used_query_range_for_exchange(self, exchange_name: str) -> None:
         """Delete the query ranges for the given exchange name"""
         cursor = self.conn.cursor()
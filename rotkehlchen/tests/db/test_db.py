@@ -12,7 +12,12 @@ from rotkehlchen.balances.manual import ManuallyTrackedBalance
 from rotkehlchen.constants import YEAR_IN_SECONDS
 from rotkehlchen.constants.assets import A_BTC, A_DAI, A_ETH, A_EUR, A_USD
 from rotkehlchen.data_handler import DataHandler
-from rotkehlchen.db.dbhandler import DBINFO_FILENAME, DBHandler, detect_sqlcipher_version
+from rotkehlchen.db.dbhandler import (
+    DBINFO_FILENAME,
+    USED_QUERY_RANGES_CHUNK_SIZE,
+    DBHandler,
+    detect_sqlcipher_version,
+)
 from rotkehlchen.db.queried_addresses import QueriedAddresses
 from rotkehlchen.db.settings import (
     DEFAULT_ACTIVE_MODULES,
@@ -1170,3 +1175,30 @@ def test_remove_queried_address_on_account_remove(data_dir, username):
     )
     addresses = queried_addresses.get_queried_addresses_for_module('makerdao_vaults')
     assert not addresses
+
+
+def test_get_used_query_ranges(database):
+    """Test that the query ranges of multiple names are fetched at once and
+    that names without a query range are not returned"""
+    assert database.get_used_query_ranges([]) == {}
+    database.update_used_query_range(name='foo', start_ts=Timestamp(0), end_ts=Timestamp(10))
+    database.update_used_query_range(name='bar', start_ts=Timestamp(5), end_ts=Timestamp(15))
+
+    query_ranges = database.get_used_query_ranges(['foo', 'bar', 'baz'])
+    assert query_ranges == {
+        'foo': (Timestamp(0), Timestamp(10)),
+        'bar': (Timestamp(5), Timestamp(15)),
+    }
+
+    # More names than fit in a single query
+    names = [f'name_{idx}' for idx in range(USED_QUERY_RANGES_CHUNK_SIZE * 2 + 1)]
+    for idx, name in enumerate(names[::2]):
+        database.update_used_query_range(
+            name=name,
+            start_ts=Timestamp(idx),
+            end_ts=Timestamp(idx + 10),
+        )
+    query_ranges = database.get_used_query_ranges(names)
+    assert query_ranges == {
+        name: (Timestamp(idx), Timestamp(idx + 10)) for idx, name in enumerate(names[::2])
+    }
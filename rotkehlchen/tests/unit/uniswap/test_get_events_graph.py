@@ -0,0 +1,131 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from rotkehlchen.chain.ethereum.uniswap.typing import EventType
+from rotkehlchen.typing import Timestamp
+
+from .utils import (
+    BURN_1_ADDRESS_1_DATA,
+    BURN_1_ADDRESS_2_DATA,
+    BURN_2_ADDRESS_2_DATA,
+    MINT_1_ADDRESS_1_DATA,
+    MINT_2_ADDRESS_1_DATA,
+    MINT_3_ADDRESS_1_DATA,
+    TEST_ADDRESS_1,
+    TEST_ADDRESS_1_LOWER,
+    TEST_ADDRESS_2,
+    TEST_ADDRESS_2_LOWER,
+    store_call_args,
+)
+
+
+@pytest.mark.parametrize('graph_query_limit', [2])
+def test_pagination(
+        uniswap_module,
+        graph_query_limit,
+        patch_graph_query_limit,  # pylint: disable=unused-argument
+):
+    """Test each aliased root field is paginated with its own cursor and that
+    the aliases without more pages are dropped, along with their variables,
+    from the next request.
+
+    First response:
+        - mints_0 (TEST_ADDRESS_1): full page, requested again.
+        - burns_0 (TEST_ADDRESS_1): not full, dropped.
+        - mints_1 (TEST_ADDRESS_2): empty, dropped.
+        - burns_1 (TEST_ADDRESS_2): full page, requested again.
+
+    Second response:
+        - mints_0 and burns_1: not full, dropped.
+    """
+    def get_graph_response():
+        responses = [
+            # First response
+            {
+                'mints_0': [MINT_1_ADDRESS_1_DATA, MINT_2_ADDRESS_1_DATA],
+                'burns_0': [BURN_1_ADDRESS_1_DATA],
+                'mints_1': [],
+                'burns_1': [BURN_1_ADDRESS_2_DATA, BURN_2_ADDRESS_2_DATA],
+            },
+            # Second response
+            {
+                'mints_0': [MINT_3_ADDRESS_1_DATA],
+                'burns_1': [],
+            },
+        ]
+        for response in responses:
+            yield response
+
+    @store_call_args
+    def fake_graph_query(
+        *args,  # pylint: disable=unused-argument
+        **kwargs,  # pylint: disable=unused-argument
+    ):
+        return next(get_response)
+
+    get_response = get_graph_response()
+
+    # Main call
+    with patch.object(uniswap_module, 'graph', new=MagicMock(query=fake_graph_query)):
+        address_events = uniswap_module._get_events_graph(
+            addresses=[TEST_ADDRESS_1, TEST_ADDRESS_2],
+            start_ts=Timestamp(0),
+            end_ts=Timestamp(1604283808),
+        )
+
+    assert len(fake_graph_query.calls) == 2
+
+    # Check first request declares and sends all the aliases
+    first_kwargs = fake_graph_query.calls[0]['kwargs']
+    for alias in ('mints_0', 'burns_0', 'mints_1', 'burns_1'):
+        assert f'{alias}: ' in first_kwargs['querystr']
+        assert first_kwargs['param_values'][f'last_id_{alias}'] == ''
+
+    # Check second request only declares and sends the remaining aliases
+    second_kwargs = fake_graph_query.calls[1]['kwargs']
+    assert 'mints_0: ' in second_kwargs['querystr']
+    assert 'burns_1: ' in second_kwargs['querystr']
+    assert 'burns_0: ' not in second_kwargs['querystr']
+    assert 'mints_1: ' not in second_kwargs['querystr']
+    assert set(second_kwargs['param_types']) == {
+        '$limit',
+        '$start_ts',
+        '$end_ts',
+        '$address_mints_0',
+        '$last_id_mints_0',
+        '$address_burns_1',
+        '$last_id_burns_1',
+    }
+    assert second_kwargs['param_values'] == {
+        'limit': graph_query_limit,
+        'start_ts': '0',
+        'end_ts': '1604283808',
+        'address_mints_0': TEST_ADDRESS_1_LOWER,
+        'last_id_mints_0': MINT_2_ADDRESS_1_DATA['id'],
+        'address_burns_1': TEST_ADDRESS_2_LOWER,
+        'last_id_burns_1': BURN_2_ADDRESS_2_DATA['id'],
+    }
+
+    # Check each event is attributed to its address and event type
+    assert set(address_events) == {TEST_ADDRESS_1, TEST_ADDRESS_2}
+    exp_events = {
+        TEST_ADDRESS_1: [
+            (MINT_1_ADDRESS_1_DATA, EventType.MINT),
+            (MINT_2_ADDRESS_1_DATA, EventType.MINT),
+            (BURN_1_ADDRESS_1_DATA, EventType.BURN),
+            (MINT_3_ADDRESS_1_DATA, EventType.MINT),
+        ],
+        TEST_ADDRESS_2: [
+            (BURN_1_ADDRESS_2_DATA, EventType.BURN),
+            (BURN_2_ADDRESS_2_DATA, EventType.BURN),
+        ],
+    }
+    for address, events in exp_events.items():
+        assert [
+            (lp_event.address, lp_event.tx_hash, lp_event.log_index, lp_event.event_type)
+            for lp_event in address_events[address]
+        ] == [
+            (address, event['transaction']['id'], int(event['logIndex']), event_type)
+            for event, event_type in events
+        ]
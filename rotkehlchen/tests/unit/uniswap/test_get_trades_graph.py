@@ -0,0 +1,218 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from rotkehlchen.chain.ethereum.trades import AMMSwap
+from rotkehlchen.chain.ethereum.uniswap.uniswap import TOKENS_QUERYSTR
+from rotkehlchen.errors import RemoteError
+from rotkehlchen.fval import FVal
+from rotkehlchen.typing import AssetAmount, Location, Timestamp
+
+from .utils import (
+    ASSET_SHUF,
+    ASSET_USDT,
+    ASSET_WETH,
+    SWAP_SHUF_WETH_TX_1,
+    SWAP_WETH_USDT_TX_1,
+    SWAP_WETH_USDT_TX_2,
+    TEST_ADDRESS_1,
+    TEST_ADDRESS_2,
+    TOKEN_DATA_SHUF,
+    TOKEN_DATA_USDT,
+    TOKEN_DATA_WETH,
+    TX_HASH_1,
+    UNISWAP_ROUTER_ADDRESS,
+    store_call_args,
+)
+
+
+def test_tokens_are_requested_once(uniswap_module):
+    """Test the swaps tokens metadata is requested via the tokens query and
+    that the tokens already seen by any previous query are not requested
+    again.
+    """
+    def get_graph_response():
+        responses = [
+            # TEST_ADDRESS_1 swaps
+            {'swaps': [{
+                'id': SWAP_SHUF_WETH_TX_1['id'],
+                'transaction': {'swaps': [SWAP_SHUF_WETH_TX_1]},
+            }]},
+            # TEST_ADDRESS_2 swaps
+            {'swaps': [{
+                'id': SWAP_WETH_USDT_TX_2['id'],
+                'transaction': {'swaps': [SWAP_WETH_USDT_TX_2]},
+            }]},
+            # TEST_ADDRESS_1 swaps (again)
+            {'swaps': [{
+                'id': SWAP_SHUF_WETH_TX_1['id'],
+                'transaction': {'swaps': [SWAP_SHUF_WETH_TX_1]},
+            }]},
+        ]
+        for response in responses:
+            yield response
+
+    @store_call_args
+    def fake_graph_query(
+        *args,  # pylint: disable=unused-argument
+        **kwargs,
+    ):
+        if kwargs['querystr'] == TOKENS_QUERYSTR:
+            return {
+                'tokens': [
+                    tokens_data[token_id] for token_id in kwargs['param_values']['token_ids']
+                ],
+            }
+        return next(get_response)
+
+    tokens_data = {
+        token_data['id']: token_data
+        for token_data in (TOKEN_DATA_SHUF, TOKEN_DATA_WETH, TOKEN_DATA_USDT)
+    }
+    get_response = get_graph_response()
+
+    # Main calls
+    with patch.object(uniswap_module, 'graph', new=MagicMock(query=fake_graph_query)):
+        address_1_trades = uniswap_module._get_trades_graph_for_address(
+            address=TEST_ADDRESS_1,
+            start_ts=Timestamp(0),
+            end_ts=Timestamp(1604283808),
+        )
+        address_2_trades = uniswap_module._get_trades_graph_for_address(
+            address=TEST_ADDRESS_2,
+            start_ts=Timestamp(0),
+            end_ts=Timestamp(1604283808),
+        )
+        address_1_trades_again = uniswap_module._get_trades_graph_for_address(
+            address=TEST_ADDRESS_1,
+            start_ts=Timestamp(0),
+            end_ts=Timestamp(1604283808),
+        )
+
+    # Check tokens are requested on first sight only
+    assert len(fake_graph_query.calls) == 5
+    tokens_calls_kwargs = [
+        call_args['kwargs'] for call_args in fake_graph_query.calls
+        if call_args['kwargs']['querystr'] == TOKENS_QUERYSTR
+    ]
+    assert [set(kwargs['param_values']['token_ids']) for kwargs in tokens_calls_kwargs] == [
+        {TOKEN_DATA_SHUF['id'], TOKEN_DATA_WETH['id']},
+        {TOKEN_DATA_USDT['id']},
+    ]
+    # `tokens.id_in` is [ID!] in the subgraph schema
+    for kwargs in tokens_calls_kwargs:
+        assert kwargs['param_types'] == {'$limit': 'Int!', '$token_ids': '[ID!]'}
+
+    # Check tokens metadata is resolved
+    for trades, exp_tokens in (
+        (address_1_trades, (ASSET_SHUF, ASSET_WETH)),
+        (address_2_trades, (ASSET_WETH, ASSET_USDT)),
+        (address_1_trades_again, (ASSET_SHUF, ASSET_WETH)),
+    ):
+        assert len(trades) == 1
+        swap = trades[0].swaps[0]
+        assert (swap.token0, swap.token1) == exp_tokens
+        assert swap.token0.symbol == exp_tokens[0].symbol
+        assert swap.token1.symbol == exp_tokens[1].symbol
+
+
+def test_missing_token_raises_remote_error(uniswap_module):
+    """Test a RemoteError is raised when the tokens query does not return
+    the metadata of a swap token.
+    """
+    def fake_graph_query(
+        *args,  # pylint: disable=unused-argument
+        **kwargs,
+    ):
+        if kwargs['querystr'] == TOKENS_QUERYSTR:
+            # SHUF metadata is missing
+            return {'tokens': [TOKEN_DATA_WETH]}
+
+        return {'swaps': [{
+            'id': SWAP_SHUF_WETH_TX_1['id'],
+            'transaction': {'swaps': [SWAP_SHUF_WETH_TX_1]},
+        }]}
+
+    # Main call
+    with patch.object(uniswap_module, 'graph', new=MagicMock(query=fake_graph_query)):
+        with pytest.raises(RemoteError) as e:
+            uniswap_module._get_trades_graph_for_address(
+                address=TEST_ADDRESS_1,
+                start_ts=Timestamp(0),
+                end_ts=Timestamp(1604283808),
+            )
+
+    assert TOKEN_DATA_SHUF['id'] in str(e.value)
+
+
+def test_transaction_swaps_entries(uniswap_module):
+    """Test the trades of a transaction with several swaps to the address are
+    the same as building them once per swaps entry, i.e. the transaction
+    trades are included once per entry.
+    """
+    def fake_graph_query(
+        *args,  # pylint: disable=unused-argument
+        **kwargs,
+    ):
+        if kwargs['querystr'] == TOKENS_QUERYSTR:
+            return {'tokens': [TOKEN_DATA_SHUF, TOKEN_DATA_WETH, TOKEN_DATA_USDT]}
+
+        tx_swaps = [SWAP_SHUF_WETH_TX_1, SWAP_WETH_USDT_TX_1]
+        return {
+            'swaps': [
+                {'id': SWAP_SHUF_WETH_TX_1['id'], 'transaction': {'swaps': tx_swaps}},
+                {'id': SWAP_WETH_USDT_TX_1['id'], 'transaction': {'swaps': tx_swaps}},
+            ],
+        }
+
+    # Main call
+    with patch.object(uniswap_module, 'graph', new=MagicMock(query=fake_graph_query)):
+        trades = uniswap_module._get_trades_graph_for_address(
+            address=TEST_ADDRESS_1,
+            start_ts=Timestamp(0),
+            end_ts=Timestamp(1604283808),
+        )
+
+    exp_swaps = [
+        AMMSwap(
+            tx_hash=TX_HASH_1,
+            log_index=1,
+            address=TEST_ADDRESS_1,
+            from_address=UNISWAP_ROUTER_ADDRESS,
+            to_address=TEST_ADDRESS_1,
+            timestamp=Timestamp(1604273256),
+            location=Location.UNISWAP,
+            token0=ASSET_SHUF,
+            token1=ASSET_WETH,
+            amount0_in=AssetAmount(FVal('100')),
+            amount1_in=AssetAmount(FVal('0')),
+            amount0_out=AssetAmount(FVal('0')),
+            amount1_out=AssetAmount(FVal('1')),
+        ),
+        AMMSwap(
+            tx_hash=TX_HASH_1,
+            log_index=2,
+            address=TEST_ADDRESS_1,
+            from_address=UNISWAP_ROUTER_ADDRESS,
+            to_address=TEST_ADDRESS_1,
+            timestamp=Timestamp(1604273256),
+            location=Location.UNISWAP,
+            token0=ASSET_WETH,
+            token1=ASSET_USDT,
+            amount0_in=AssetAmount(FVal('1')),
+            amount1_in=AssetAmount(FVal('0')),
+            amount0_out=AssetAmount(FVal('0')),
+            amount1_out=AssetAmount(FVal('400')),
+        ),
+    ]
+    # The trades built once per swaps entry of the transaction
+    exp_trades = (
+        uniswap_module._tx_swaps_to_trades(exp_swaps) +
+        uniswap_module._tx_swaps_to_trades(exp_swaps)
+    )
+    assert len(trades) == 2
+    assert trades == exp_trades
+    # AMMSwap equality only compares the tx hash and log index
+    assert [tuple(swap) for trade in trades for swap in trade.swaps] == [
+        tuple(swap) for trade in exp_trades for swap in trade.swaps
+    ]
@@ -89,8 +89,9 @@ def test_pagination(
 
     assert len(fake_graph_query.calls) == no_requests
 
-    # Check limit and offset
+    # Check limit and cursor
+    exp_last_ids = ['', TOKEN_DAY_DATA_SHUF['id']]
     for idx, call_args in enumerate(fake_graph_query.calls):
         param_values = call_args['kwargs']['param_values']
         assert param_values['limit'] == graph_query_limit
-        assert param_values['offset'] == idx * graph_query_limit
+        assert param_values['last_id'] == exp_last_ids[idx]
@@ -1,4 +1,6 @@
+import copy
 import functools
+from typing import Any, Dict
 
 from rotkehlchen.accounting.structures import Balance
 from rotkehlchen.assets.asset import EthereumToken
@@ -21,6 +23,9 @@ from rotkehlchen.typing import AssetAmount, Price, Timestamp
 TEST_ADDRESS_1 = deserialize_ethereum_address('0xfeF0E7635281eF8E3B705e9C5B86e1d3B0eAb397')
 TEST_ADDRESS_2 = deserialize_ethereum_address('0xcf2B8EeC2A9cE682822b252a1e9B78EedebEFB02')
 TEST_ADDRESS_3 = deserialize_ethereum_address('0x7777777777777777777777777777777777777777')
+# Addresses as returned by the subgraph
+TEST_ADDRESS_1_LOWER = '0xfef0e7635281ef8e3b705e9c5b86e1d3b0eab397'
+TEST_ADDRESS_2_LOWER = '0xcf2b8eec2a9ce682822b252a1e9b78eedebefb02'
 
 # Known tokens
 ASSET_USDT = EthereumToken('USDT')
@@ -177,11 +182,13 @@ EXP_UNKNOWN_ASSETS_2 = {ASSET_TGX}
 # Method: `_get_unknown_asset_price_graph`
 # 'tokenDayDatas' subgraph response data for SHUF
 TOKEN_DAY_DATA_SHUF = {
+    'id': f'{ASSET_SHUF.ethereum_address.lower()}-18561',
     'token': {'id': ASSET_SHUF.ethereum_address},
     'priceUSD': '0.2373897544244518146892192714786454',
 }
 # 'tokenDayDatas' subgraph response data for TGX
 TOKEN_DAY_DATA_TGX = {
+    'id': f'{ASSET_TGX.ethereum_address.lower()}-18561',
     'token': {'id': ASSET_TGX.ethereum_address},
     'priceUSD': '0.2635575008126147388714187358722384',
 }
@@ -289,6 +296,102 @@ UPDATED_LIQUIDITY_POOL_2_ONLY_USDT = (
     )
 )
 
+# Method: `_get_events_graph`
+# 'mints' and 'burns' subgraph response pair data (SHUF/WETH)
+LP_EVENT_PAIR_DATA: Dict[str, Any] = {
+    'id': '0x260e069dead76baac587b5141bb606ef8b9bab6c',
+    'token0': {
+        'decimals': '18',
+        'id': '0x3a9fff453d50d4ac52a6890647b823379ba36b9e',
+        'name': 'Shuffle.Monster V3',
+        'symbol': 'SHUF',
+    },
+    'token1': {
+        'decimals': '18',
+        'id': '0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2',
+        'name': 'Wrapped Ether',
+        'symbol': 'WETH',
+    },
+}
+# 'mints' subgraph response data for TEST_ADDRESS_1
+MINT_1_ADDRESS_1_DATA: Dict[str, Any] = {
+    'id': '0x1111111111111111111111111111111111111111111111111111111111111111-1',
+    'transaction': {'id': '0x1111111111111111111111111111111111111111111111111111111111111111'},
+    'logIndex': '1',
+    'timestamp': '1604273256',
+    'to': TEST_ADDRESS_1_LOWER,
+    'pair': LP_EVENT_PAIR_DATA,
+    'amount0': '605.773209925184996494',
+    'amount1': '1.106631443395672732',
+    'amountUSD': '872.4689300619698095220125311431804',
+    'liquidity': '1.220680531244355402',
+}
+# 'mints' subgraph response data for TEST_ADDRESS_1
+MINT_2_ADDRESS_1_DATA: Dict[str, Any] = {
+    'id': '0x2222222222222222222222222222222222222222222222222222222222222222-2',
+    'transaction': {'id': '0x2222222222222222222222222222222222222222222222222222222222222222'},
+    'logIndex': '2',
+    'timestamp': '1604273256',
+    'to': TEST_ADDRESS_1_LOWER,
+    'pair': LP_EVENT_PAIR_DATA,
+    'amount0': '605.773209925184996494',
+    'amount1': '1.106631443395672732',
+    'amountUSD': '872.4689300619698095220125311431804',
+    'liquidity': '1.220680531244355402',
+}
+# 'mints' subgraph response data for TEST_ADDRESS_1
+MINT_3_ADDRESS_1_DATA: Dict[str, Any] = {
+    'id': '0x3333333333333333333333333333333333333333333333333333333333333333-3',
+    'transaction': {'id': '0x3333333333333333333333333333333333333333333333333333333333333333'},
+    'logIndex': '3',
+    'timestamp': '1604273256',
+    'to': TEST_ADDRESS_1_LOWER,
+    'pair': LP_EVENT_PAIR_DATA,
+    'amount0': '605.773209925184996494',
+    'amount1': '1.106631443395672732',
+    'amountUSD': '872.4689300619698095220125311431804',
+    'liquidity': '1.220680531244355402',
+}
+# 'burns' subgraph response data for TEST_ADDRESS_1
+BURN_1_ADDRESS_1_DATA: Dict[str, Any] = {
+    'id': '0x4444444444444444444444444444444444444444444444444444444444444444-4',
+    'transaction': {'id': '0x4444444444444444444444444444444444444444444444444444444444444444'},
+    'logIndex': '4',
+    'timestamp': '1604273256',
+    'sender': TEST_ADDRESS_1_LOWER,
+    'pair': LP_EVENT_PAIR_DATA,
+    'amount0': '605.773209925184996494',
+    'amount1': '1.106631443395672732',
+    'amountUSD': '872.4689300619698095220125311431804',
+    'liquidity': '1.220680531244355402',
+}
+# 'burns' subgraph response data for TEST_ADDRESS_2
+BURN_1_ADDRESS_2_DATA: Dict[str, Any] = {
+    'id': '0x5555555555555555555555555555555555555555555555555555555555555555-5',
+    'transaction': {'id': '0x5555555555555555555555555555555555555555555555555555555555555555'},
+    'logIndex': '5',
+    'timestamp': '1604273256',
+    'sender': TEST_ADDRESS_2_LOWER,
+    'pair': LP_EVENT_PAIR_DATA,
+    'amount0': '605.773209925184996494',
+    'amount1': '1.106631443395672732',
+    'amountUSD': '872.4689300619698095220125311431804',
+    'liquidity': '1.220680531244355402',
+}
+# 'burns' subgraph response data for TEST_ADDRESS_2
+BURN_2_ADDRESS_2_DATA: Dict[str, Any] = {
+    'id': '0x6666666666666666666666666666666666666666666666666666666666666666-6',
+    'transaction': {'id': '0x6666666666666666666666666666666666666666666666666666666666666666'},
+    'logIndex': '6',
+    'timestamp': '1604273256',
+    'sender': TEST_ADDRESS_2_LOWER,
+    'pair': LP_EVENT_PAIR_DATA,
+    'amount0': '605.773209925184996494',
+    'amount1': '1.106631443395672732',
+    'amountUSD': '872.4689300619698095220125311431804',
+    'liquidity': '1.220680531244355402',
+}
+
 # Method: `_calculate_events_balances`
 
 LP_1_EVENTS = [
@@ -448,14 +551,98 @@ LP_3_EVENTS_BALANCE = (
     )
 )
 
+# Logic: Get trades
+
+# Method: `_get_trades_graph_for_address`
+TX_HASH_1 = '0xa9ce328d0e2d2fa8932890bfd4bc61411abd34a4aaa48fc8b853c873a55ea824'
+TX_HASH_2 = '0x27ddad4f187e965a3ee37257b75d297ff79b2663fd0a2d8d15f7efaccf1238fa'
+UNISWAP_ROUTER_ADDRESS = deserialize_ethereum_address(
+    '0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D',
+)
+
+# 'tokens' subgraph response data for SHUF, WETH and USDT
+TOKEN_DATA_SHUF: Dict[str, Any] = {
+    'id': '0x3a9fff453d50d4ac52a6890647b823379ba36b9e',
+    'decimals': '18',
+    'name': 'Shuffle.Monster V3',
+    'symbol': 'SHUF',
+}
+TOKEN_DATA_WETH: Dict[str, Any] = {
+    'id': '0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2',
+    'decimals': '18',
+    'name': 'Wrapped Ether',
+    'symbol': 'WETH',
+}
+TOKEN_DATA_USDT: Dict[str, Any] = {
+    'id': '0xdac17f958d2ee523a2206206994597c13d831ec7',
+    'decimals': '6',
+    'name': 'Tether USD',
+    'symbol': 'USDT',
+}
+
+# 'swaps' subgraph response transaction swap data where TEST_ADDRESS_1 sells
+# SHUF for WETH in TX_HASH_1
+SWAP_SHUF_WETH_TX_1: Dict[str, Any] = {
+    'id': f'{TX_HASH_1}-1',
+    'logIndex': '1',
+    'sender': '0x7a250d5630b4cf539739df2c5dacb4c659f2488d',
+    'to': TEST_ADDRESS_1_LOWER,
+    'timestamp': '1604273256',
+    'pair': {
+        'token0': {'id': '0x3a9fff453d50d4ac52a6890647b823379ba36b9e'},
+        'token1': {'id': '0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2'},
+    },
+    'amount0In': '100',
+    'amount0Out': '0',
+    'amount1In': '0',
+    'amount1Out': '1',
+}
+# 'swaps' subgraph response transaction swap data where TEST_ADDRESS_1 sells
+# WETH for USDT in TX_HASH_1
+SWAP_WETH_USDT_TX_1: Dict[str, Any] = {
+    'id': f'{TX_HASH_1}-2',
+    'logIndex': '2',
+    'sender': '0x7a250d5630b4cf539739df2c5dacb4c659f2488d',
+    'to': TEST_ADDRESS_1_LOWER,
+    'timestamp': '1604273256',
+    'pair': {
+        'token0': {'id': '0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2'},
+        'token1': {'id': '0xdac17f958d2ee523a2206206994597c13d831ec7'},
+    },
+    'amount0In': '1',
+    'amount0Out': '0',
+    'amount1In': '0',
+    'amount1Out': '400',
+}
+# 'swaps' subgraph response transaction swap data where TEST_ADDRESS_2 sells
+# WETH for USDT in TX_HASH_2
+SWAP_WETH_USDT_TX_2: Dict[str, Any] = {
+    'id': f'{TX_HASH_2}-2',
+    'logIndex': '2',
+    'sender': '0x7a250d5630b4cf539739df2c5dacb4c659f2488d',
+    'to': TEST_ADDRESS_2_LOWER,
+    'timestamp': '1604273256',
+    'pair': {
+        'token0': {'id': '0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2'},
+        'token1': {'id': '0xdac17f958d2ee523a2206206994597c13d831ec7'},
+    },
+    'amount0In': '1',
+    'amount0Out': '0',
+    'amount1In': '0',
+    'amount1Out': '400',
+}
+
 
 def store_call_args(func):
     """
     Helper function for pagination tests that call `self.graph.query()`.
+
+    The call arguments are deep copied as the pagination loops update
+    `param_values` in place.
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        call_args = {'args': args, 'kwargs': kwargs}
+        call_args = {'args': copy.deepcopy(args), 'kwargs': copy.deepcopy(kwargs)}
         wrapper.calls.append(call_args)
         return func(*args, **kwargs)
 